@@ -24,7 +24,16 @@ KEYVAULT_PATH = "Skat_webservice"
 DATA_BUCKETS = "Data Buckets"
 EVENT_LOG = "Event Log"
 
+# Connection pool data source names
+UDREJSE_DB = "Udrejse"
+FAELLES_SQL_DATAINTEGRATION_DB = "FaellesSQL Dataintegration"
+FAELLES_SQL_DWH_DB = "FaellesSQL DWH"
+
 # Other configs
 INCOME_MONTHS = 18
 MIN_INCOME = 10_000
-MAX_HANDLED_CASES = 400
+
+# Default run budgets. Can be overridden by "time_budget_minutes" and "max_skat_calls" in the process arguments.
+TIME_BUDGET_MINUTES = 60
+MAX_TIME_BUDGET_MINUTES = 24 * 60
+MAX_SKAT_CALLS = 400
@@ -12,6 +12,7 @@ from robot_framework import reset
 from robot_framework.exceptions import BusinessError, handle_error, log_exception
 from robot_framework import process
 from robot_framework import config
+from robot_framework.sub_process import connection_pool
 
 
 def main():
@@ -23,26 +24,30 @@ def main():
     initialize.initialize(orchestrator_connection)
 
     error_count = 0
-    for _ in range(config.MAX_RETRY_COUNT):
-        try:
-            reset.reset(orchestrator_connection)
-            process.process(orchestrator_connection)
-            break
-
-        # If any business rules are broken the robot should stop entirely.
-        except BusinessError as error:
-            handle_error("Business Error", error, None, orchestrator_connection)
-            break
-
-        # We actually want to catch all exceptions possible here.
-        # pylint: disable-next = broad-exception-caught
-        except Exception as error:
-            error_count += 1
-            handle_error(f"Process Error #{error_count}", error, None, orchestrator_connection)
-
-    reset.clean_up(orchestrator_connection)
-    reset.close_all(orchestrator_connection)
-    reset.kill_all(orchestrator_connection)
+    # The connection pool is closed in finally so connections are released even if error handling fails.
+    try:
+        for _ in range(config.MAX_RETRY_COUNT):
+            try:
+                reset.reset(orchestrator_connection)
+                process.process(orchestrator_connection)
+                break
+
+            # If any business rules are broken the robot should stop entirely.
+            except BusinessError as error:
+                handle_error("Business Error", error, None, orchestrator_connection)
+                break
+
+            # We actually want to catch all exceptions possible here.
+            # pylint: disable-next = broad-exception-caught
+            except Exception as error:
+                error_count += 1
+                handle_error(f"Process Error #{error_count}", error, None, orchestrator_connection)
+
+        reset.clean_up(orchestrator_connection)
+        reset.close_all(orchestrator_connection)
+        reset.kill_all(orchestrator_connection)
+    finally:
+        connection_pool.close_all(orchestrator_connection)
 
     if config.FAIL_ROBOT_ON_TOO_MANY_ERRORS and error_count == config.MAX_RETRY_COUNT:
         raise RuntimeError("Process failed too many times.")
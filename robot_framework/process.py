@@ -3,8 +3,8 @@
 import json
 from datetime import datetime
 import re
+import time
 
-import pyodbc
 from OpenOrchestrator.orchestrator_connection.connection import OrchestratorConnection
 from itk_dev_shared_components.kmd_nova.authentication import NovaAccess
 from itk_dev_shared_components.graph import authentication as graph_authentication
@@ -12,7 +12,8 @@ from itk_dev_shared_components.graph import mail as graph_mail
 from itk_dev_shared_components.smtp import smtp_util
 import itk_dev_event_log as event_log
 
-from robot_framework.sub_process import skat_webservice, database, nova
+from robot_framework.sub_process import skat_webservice, database, nova, connection_pool
+from robot_framework.sub_process.scheduler import RunScheduler, read_time_budget, read_max_skat_calls
 from robot_framework import config
 
 
@@ -31,53 +32,56 @@ def process(orchestrator_connection: OrchestratorConnection) -> None:
         orchestrator_connection.log_info("No emails in queue.")
         return
 
+    process_arguments = json.loads(orchestrator_connection.process_arguments)
+    approved_senders = process_arguments["approved_senders"]
+    time_budget = read_time_budget(process_arguments)
+    max_skat_calls = read_max_skat_calls(process_arguments)
+
     for mail in mails:
         email_text = mail.get_text()
         sender_email = re.findall("BrugerE-mail: (.+?)AZ-ident", email_text)[0]
         sender_ident = re.findall("AZ-ident: (.+?)Antal", email_text)[0]
         requested_count = int(re.findall(r"Antal ønskede sager(\d+)", email_text)[0])
 
-        approved_senders = json.loads(orchestrator_connection.process_arguments)["approved_senders"]
-
         if sender_ident not in approved_senders:
             orchestrator_connection.log_info(f"Request denied for: {sender_email} - {sender_ident}")
             smtp_util.send_email(sender_email, "itk-rpa@mkb.aarhus.dk", "Anmodning afvist", "Din anmodning til Udrejsekontrol er blevet afvist, da du ikke er på listen af godkendte medarbejdere.", smtp_server=config.SMTP_SERVER, smtp_port=config.SMTP_PORT)
             graph_mail.delete_email(mail, graph_access)
         else:
-            found_count, handled_count = find_cases(requested_count, orchestrator_connection)
-            orchestrator_connection.log_info(f"{found_count} new cases created in Nova. {handled_count} people checked.")
-            smtp_util.send_email(sender_email, "itk-rpa@mkb.aarhus.dk", "Udrejsesager oprettet", f"Din anmodning til Udrejsekontrol er blevet behandlet.\nDer er blevet gennemsøgt {handled_count} personer og oprettet {found_count} nye sager i KMD Nova.", smtp_server=config.SMTP_SERVER, smtp_port=config.SMTP_PORT)
+            scheduler = RunScheduler(requested_count, time_budget=time_budget, max_skat_calls=max_skat_calls)
+            find_cases(scheduler, orchestrator_connection)
+            orchestrator_connection.log_info(f"{scheduler.found_count} new cases created in Nova. {scheduler.handled_count} people checked. Stop reason: {scheduler.stop_reason}. Elapsed: {scheduler.elapsed}.")
+            smtp_util.send_email(sender_email, "itk-rpa@mkb.aarhus.dk", "Udrejsesager oprettet", f"Din anmodning til Udrejsekontrol er blevet behandlet.\n{scheduler.progress_report()}", smtp_server=config.SMTP_SERVER, smtp_port=config.SMTP_PORT)
             graph_mail.delete_email(mail, graph_access)
             return
 
 
-def find_cases(requested_count: int, orchestrator_connection: OrchestratorConnection) -> tuple[int, int]:
+def find_cases(scheduler: RunScheduler, orchestrator_connection: OrchestratorConnection) -> None:
     """Search through a list of possible candidates and create cases in Nova for the relevant ones.
+    The search continues until the scheduler decides to stop or the candidates run out.
+    Each candidate is fully handled before the scheduler is asked again, so the database
+    always reflects the cases created in Nova.
 
     Args:
-        requested_count: The number of cases to aim for.
+        scheduler: The scheduler keeping track of the run's budgets and progress.
         orchestrator_connection: The connection to Orchestrator.
-
-    Returns:
-        The number of created cases and the number of checked candidates.
     """
     nova_creds = orchestrator_connection.get_credential(config.NOVA_API)
     nova_access = NovaAccess(nova_creds.username, nova_creds.password)
 
-    udrejse_conn = pyodbc.connect(orchestrator_connection.get_constant(config.DATA_BUCKETS).value)
+    udrejse_conn = connection_pool.get_connection(config.UDREJSE_DB, orchestrator_connection.get_constant(config.DATA_BUCKETS).value)
     event_log.setup_logging(orchestrator_connection.get_constant(config.EVENT_LOG).value)
 
     candidates = database.get_candidate_list(orchestrator_connection, udrejse_conn)
 
-    handled_count = 0
-    found_count = 0
-
     caller_info, signer = skat_webservice.setup_webservice(orchestrator_connection)
 
     for candidate in candidates:
-        if handled_count >= config.MAX_HANDLED_CASES or found_count >= requested_count:
+        if not scheduler.should_continue():
             break
 
+        check_start = time.monotonic()
+
         has_income = skat_webservice.check_income(candidate.cpr, caller_info, signer)
         event_log.emit(orchestrator_connection.process_name, "Indkomst tjekket")
 
@@ -85,10 +89,9 @@ def find_cases(requested_count: int, orchestrator_connection: OrchestratorConnec
             orchestrator_connection.log_info(f"Creating case in Nova on {candidate.cpr}")
             event_log.emit(orchestrator_connection.process_name, "Sag oprettet i Nova")
             nova.add_case(candidate, nova_access)
-            found_count += 1
 
         database.update_person(udrejse_conn, candidate, has_income)
 
-        handled_count += 1
-
-    return found_count, handled_count
+        scheduler.record_check(time.monotonic() - check_start, not has_income)
+    else:
+        scheduler.mark_candidates_exhausted()
@@ -2,6 +2,8 @@
 
 from OpenOrchestrator.orchestrator_connection.connection import OrchestratorConnection
 
+from robot_framework.sub_process import connection_pool
+
 
 def reset(orchestrator_connection: OrchestratorConnection) -> None:
     """Clean up, close/kill all programs and start them again. """
@@ -15,11 +17,16 @@ def reset(orchestrator_connection: OrchestratorConnection) -> None:
 def clean_up(orchestrator_connection: OrchestratorConnection) -> None:
     """Do any cleanup needed to leave a blank slate."""
     orchestrator_connection.log_trace("Doing cleanup.")
+    connection_pool.rollback_all()
 
 
 def close_all(orchestrator_connection: OrchestratorConnection) -> None:
-    """Gracefully close all applications used by the robot."""
+    """Gracefully close all applications used by the robot.
+    Pooled database connections are kept open across attempts. They are only health-checked here
+    and closed once by connection_pool.close_all in linear_framework.main.
+    """
     orchestrator_connection.log_trace("Closing all applications.")
+    connection_pool.remove_unhealthy()
 
 
 def kill_all(orchestrator_connection: OrchestratorConnection) -> None:
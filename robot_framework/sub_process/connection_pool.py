@@ -0,0 +1,146 @@
+"""This module keeps a pool of database connections that are reused for the lifetime of the process."""
+
+import time
+from dataclasses import dataclass, field
+
+import pyodbc
+from OpenOrchestrator.orchestrator_connection.connection import OrchestratorConnection
+
+
+@dataclass
+class ConnectionMetrics:
+    """A dataclass holding connection metrics for a single data source."""
+    connect_count: int = 0
+    reuse_count: int = 0
+    failed_health_checks: int = 0
+    connect_times: list[float] = field(default_factory=list)
+
+    @property
+    def total_connect_time(self) -> float:
+        """The total time in seconds spent opening connections."""
+        return sum(self.connect_times)
+
+    def __str__(self) -> str:
+        average = self.total_connect_time / self.connect_count if self.connect_count else 0
+        return (f"{self.connect_count} connects ({self.total_connect_time:.2f}s total, {average:.2f}s avg), "
+                f"{self.reuse_count} reuses, {self.failed_health_checks} failed health checks")
+
+
+_connections: dict[str, pyodbc.Connection] = {}
+_connection_strings: dict[str, str] = {}
+_metrics: dict[str, ConnectionMetrics] = {}
+
+
+def get_connection(name: str, connection_string: str) -> pyodbc.Connection:
+    """Get a connection to the given data source.
+    An existing connection is reused if it was opened with the same connection string
+    and passes a health check, otherwise a new connection is opened and kept in the pool.
+
+    Args:
+        name: The name used to identify the data source in the pool.
+        connection_string: The ODBC connection string used if a new connection is needed.
+
+    Returns:
+        An open connection to the data source.
+    """
+    metrics = _metrics.setdefault(name, ConnectionMetrics())
+
+    connection = _connections.get(name)
+    if connection is not None:
+        if _connection_strings[name] != connection_string:
+            _close(connection)
+        elif _is_healthy(connection):
+            metrics.reuse_count += 1
+            return connection
+        else:
+            metrics.failed_health_checks += 1
+            _close(connection)
+
+    start_time = time.perf_counter()
+    connection = pyodbc.connect(connection_string)
+    metrics.connect_times.append(time.perf_counter() - start_time)
+    metrics.connect_count += 1
+
+    _connections[name] = connection
+    _connection_strings[name] = connection_string
+    return connection
+
+
+def _is_healthy(connection: pyodbc.Connection) -> bool:
+    """Check if a connection is still open and able to run a query.
+
+    Args:
+        connection: The connection to check.
+
+    Returns:
+        True if the connection can be used.
+    """
+    if connection.closed:
+        return False
+
+    try:
+        connection.execute("SELECT 1").fetchone()
+    except pyodbc.Error:
+        return False
+
+    return True
+
+
+def _close(connection: pyodbc.Connection) -> None:
+    """Close a connection, ignoring errors from connections that are already broken.
+
+    Args:
+        connection: The connection to close.
+    """
+    try:
+        connection.close()
+    except pyodbc.Error:
+        pass
+
+
+def rollback_all() -> None:
+    """Roll back any uncommitted transactions on the pooled connections."""
+    for connection in _connections.values():
+        if not connection.closed:
+            try:
+                connection.rollback()
+            except pyodbc.Error:
+                pass
+
+
+def remove_unhealthy() -> None:
+    """Close and remove any pooled connections that fail a health check,
+    so the next attempt starts with working connections.
+    """
+    for name, connection in list(_connections.items()):
+        if not _is_healthy(connection):
+            _metrics[name].failed_health_checks += 1
+            _close(connection)
+            del _connections[name]
+            del _connection_strings[name]
+
+
+def close_all(orchestrator_connection: OrchestratorConnection) -> None:
+    """Close all pooled connections and log the collected metrics.
+    Should only be called once when the robot is done.
+
+    Args:
+        orchestrator_connection: The connection to Orchestrator.
+    """
+    for name, connection in _connections.items():
+        _close(connection)
+        orchestrator_connection.log_trace(f"Closed connection to {name}.")
+    _connections.clear()
+    _connection_strings.clear()
+
+    for name, metrics in get_metrics().items():
+        orchestrator_connection.log_info(f"Connection metrics for {name}: {metrics}")
+
+
+def get_metrics() -> dict[str, ConnectionMetrics]:
+    """Get the connection metrics collected for each data source.
+
+    Returns:
+        A dict mapping data source names to their metrics.
+    """
+    return dict(_metrics)
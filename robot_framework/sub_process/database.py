@@ -8,6 +8,7 @@ import pyodbc
 from OpenOrchestrator.orchestrator_connection.connection import OrchestratorConnection
 
 from robot_framework import config
+from robot_framework.sub_process import connection_pool
 
 
 @dataclass
@@ -26,12 +27,13 @@ def get_candidate_list(orchestrator_connection: OrchestratorConnection, udrejse_
 
     Args:
         orchestrator_connection: The connection to Orchestrator.
+        udrejse_conn: The connection to the Udrejse database of checked people.
 
     Returns:
         A list of candidates as Person objects.
     """
     faelles_sql_creds = orchestrator_connection.get_credential(config.FAELLES_SQL)
-    faelles_sql_conn = pyodbc.connect(f'Server=FaellesSQL;Database=Dataintegration;UID={faelles_sql_creds.username};PWD={faelles_sql_creds.password};Driver={{ODBC Driver 17 for SQL Server}}')
+    faelles_sql_conn = connection_pool.get_connection(config.FAELLES_SQL_DATAINTEGRATION_DB, f'Server=FaellesSQL;Database=Dataintegration;UID={faelles_sql_creds.username};PWD={faelles_sql_creds.password};Driver={{ODBC Driver 17 for SQL Server}}')
 
     checked_people = udrejse_conn.execute("SELECT id FROM [MKB-ITK-RPA].dbo.Udrejsekontrol").fetchall()
     checked_people = {p[0] for p in checked_people}
@@ -53,7 +55,7 @@ def get_candidate_list(orchestrator_connection: OrchestratorConnection, udrejse_
             candidates.remove(candidate)
 
     # Sort on amount of people on their address
-    adresse_conn = pyodbc.connect("Server=FaellesSQL;Database=DWH;Trusted_Connection=Yes;Driver={ODBC Driver 17 for SQL Server}")
+    adresse_conn = connection_pool.get_connection(config.FAELLES_SQL_DWH_DB, "Server=FaellesSQL;Database=DWH;Trusted_Connection=Yes;Driver={ODBC Driver 17 for SQL Server}")
     address_keys = adresse_conn.execute("SELECT CPR, Adressenoegle FROM DWH.Mart.AdresseAktuel").fetchall()
 
     address_count = Counter(ak[1] for ak in address_keys)
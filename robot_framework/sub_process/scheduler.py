@@ -0,0 +1,221 @@
+"""This module is responsible for deciding how long a run should continue checking candidates."""
+
+import math
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from enum import Enum
+
+from robot_framework import config
+
+
+# Weight of the newest measurement in the moving average of check durations.
+SMOOTHING_FACTOR = 0.2
+
+
+class StopReason(Enum):
+    """The reasons a run can stop."""
+    REQUEST_FULFILLED = "request_fulfilled"
+    TIME_BUDGET = "time_budget"
+    SKAT_CALL_BUDGET = "skat_call_budget"
+    CANDIDATES_EXHAUSTED = "candidates_exhausted"
+
+
+class RunScheduler:  # pylint: disable=too-many-instance-attributes
+    """Keeps track of the progress of a run and decides when to stop.
+    The scheduler keeps a moving estimate of the time per candidate and the hit rate
+    and uses these to avoid starting a check that would overrun the time budget.
+    """
+
+    def __init__(self, requested_count: int, time_budget: timedelta, max_skat_calls: int | None = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            requested_count: The number of cases to aim for.
+            time_budget: The wall-clock time the run may use.
+            max_skat_calls: The maximum number of calls to the SKAT webservice, if any.
+            clock: A function returning the current time in seconds.
+        """
+        self.requested_count = requested_count
+        self.time_budget = time_budget
+        self.max_skat_calls = max_skat_calls
+
+        self.handled_count = 0
+        self.found_count = 0
+        self.seconds_per_check: float | None = None
+        self.stop_reason: StopReason | None = None
+
+        self._clock = clock
+        self._start_time = clock()
+
+    @property
+    def elapsed(self) -> timedelta:
+        """The time passed since the run started."""
+        return timedelta(seconds=self._clock() - self._start_time)
+
+    @property
+    def remaining(self) -> timedelta:
+        """The time left of the time budget."""
+        return self.time_budget - self.elapsed
+
+    @property
+    def hit_rate(self) -> float | None:
+        """The fraction of checked candidates that resulted in a case, if any have been checked."""
+        if not self.handled_count:
+            return None
+        return self.found_count / self.handled_count
+
+    def should_continue(self) -> bool:
+        """Decide if another candidate should be checked.
+        Sets stop_reason when the run should stop.
+
+        Returns:
+            True if there is room for another check.
+        """
+        if self.found_count >= self.requested_count:
+            self.stop_reason = StopReason.REQUEST_FULFILLED
+        elif self.max_skat_calls is not None and self.handled_count >= self.max_skat_calls:
+            self.stop_reason = StopReason.SKAT_CALL_BUDGET
+        elif self.remaining.total_seconds() < (self.seconds_per_check or 0):
+            self.stop_reason = StopReason.TIME_BUDGET
+
+        return self.stop_reason is None
+
+    def mark_candidates_exhausted(self) -> None:
+        """Register that there are no more candidates to check."""
+        if self.found_count >= self.requested_count:
+            self.stop_reason = StopReason.REQUEST_FULFILLED
+        else:
+            self.stop_reason = StopReason.CANDIDATES_EXHAUSTED
+
+    def record_check(self, duration: float, case_created: bool) -> None:
+        """Register a finished candidate check.
+
+        Args:
+            duration: The time in seconds the check took.
+            case_created: Whether a case was created for the candidate.
+        """
+        self.handled_count += 1
+        if case_created:
+            self.found_count += 1
+
+        if self.seconds_per_check is None:
+            self.seconds_per_check = duration
+        else:
+            self.seconds_per_check = SMOOTHING_FACTOR * duration + (1 - SMOOTHING_FACTOR) * self.seconds_per_check
+
+    def estimate_remaining_checks(self) -> int | None:
+        """Estimate how many more candidates must be checked to reach the requested count.
+
+        Returns:
+            The estimated number of checks, or None if no cases have been found yet.
+        """
+        missing = max(self.requested_count - self.found_count, 0)
+        if not missing:
+            return 0
+        if not self.hit_rate:
+            return None
+        return math.ceil(missing / self.hit_rate)
+
+    def estimate_time_to_completion(self) -> timedelta | None:
+        """Estimate the time needed to reach the requested count.
+
+        Returns:
+            The estimated time, or None if there is not enough data to make an estimate.
+        """
+        checks = self.estimate_remaining_checks()
+        if checks is None or self.seconds_per_check is None:
+            return None
+        return timedelta(seconds=checks * self.seconds_per_check)
+
+    def progress_report(self) -> str:
+        """Create a progress report in Danish to send to the requester.
+
+        Returns:
+            The report text.
+        """
+        lines = [f"Der er blevet gennemsøgt {self.handled_count} personer og oprettet {self.found_count} af {self.requested_count} ønskede sager i KMD Nova."]
+
+        if self.found_count >= self.requested_count:
+            return "\n".join(lines)
+
+        if self.stop_reason == StopReason.CANDIDATES_EXHAUSTED:
+            lines.append("Der er ikke flere personer at gennemsøge.")
+            return "\n".join(lines)
+
+        if self.stop_reason == StopReason.TIME_BUDGET:
+            lines.append(f"Kørslen blev stoppet, da tidsrammen på {_format_minutes(self.time_budget)} var brugt.")
+        elif self.stop_reason == StopReason.SKAT_CALL_BUDGET:
+            lines.append(f"Kørslen blev stoppet, da grænsen på {self.max_skat_calls} opslag hos SKAT var nået.")
+        else:
+            return "\n".join(lines)
+
+        checks = self.estimate_remaining_checks()
+        eta = self.estimate_time_to_completion()
+        if checks is None or eta is None:
+            lines.append("Der er ikke fundet nok sager til at estimere, hvor lang tid de resterende sager vil tage.")
+        else:
+            lines.append(f"Det anslås, at de resterende sager kræver ca. {checks} opslag mere og {_format_minutes(eta)}.")
+
+        return "\n".join(lines)
+
+
+def _format_minutes(duration: timedelta) -> str:
+    """Format a duration as a whole number of minutes in Danish, rounded up to at least 1 minute.
+
+    Args:
+        duration: The duration to format.
+
+    Returns:
+        The formatted duration.
+    """
+    minutes = max(math.ceil(duration.total_seconds() / 60), 1)
+    return "1 minut" if minutes == 1 else f"{minutes} minutter"
+
+
+def read_time_budget(process_arguments: dict) -> timedelta:
+    """Read the time budget from the process arguments.
+    The default from config is used if the argument is missing or null.
+
+    Args:
+        process_arguments: The parsed process arguments.
+
+    Returns:
+        The time budget.
+
+    Raises:
+        ValueError: If the value isn't a finite number between 0 and config.MAX_TIME_BUDGET_MINUTES.
+    """
+    value = process_arguments.get("time_budget_minutes")
+    if value is None:
+        return timedelta(minutes=config.TIME_BUDGET_MINUTES)
+
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or not 0 <= value <= config.MAX_TIME_BUDGET_MINUTES:
+        raise ValueError(f"Process argument 'time_budget_minutes' must be a number between 0 and {config.MAX_TIME_BUDGET_MINUTES}, got {value!r}.")
+
+    return timedelta(minutes=value)
+
+
+def read_max_skat_calls(process_arguments: dict) -> int | None:
+    """Read the SKAT call budget from the process arguments.
+    The default from config is used if the argument is missing. An explicit null means no limit.
+
+    Args:
+        process_arguments: The parsed process arguments.
+
+    Returns:
+        The maximum number of SKAT calls, or None if there is no limit.
+
+    Raises:
+        ValueError: If the value isn't null or a non-negative integer.
+    """
+    if "max_skat_calls" not in process_arguments:
+        return config.MAX_SKAT_CALLS
+
+    value = process_arguments["max_skat_calls"]
+    if value is None:
+        return None
+
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"Process argument 'max_skat_calls' must be null or a non-negative integer, got {value!r}.")
+
+    return value
@@ -0,0 +1,133 @@
+"""Tests for the database connection pool."""
+
+import pyodbc
+import pytest
+
+from robot_framework.sub_process import connection_pool
+
+
+class FakeConnection:
+    """A stand-in for pyodbc.Connection."""
+
+    def __init__(self, connection_string: str):
+        self.connection_string = connection_string
+        self.closed = False
+        self.broken = False
+        self.rollback_count = 0
+
+    def execute(self, _query: str) -> "FakeConnection":
+        """Run a query, failing if the connection is broken."""
+        if self.broken:
+            raise pyodbc.Error("Connection lost")
+        return self
+
+    def fetchone(self) -> tuple:
+        """Return a single row."""
+        return (1,)
+
+    def rollback(self) -> None:
+        """Count rollbacks."""
+        self.rollback_count += 1
+
+    def close(self) -> None:
+        """Mark the connection as closed."""
+        self.closed = True
+
+
+class FakeOrchestratorConnection:
+    """A stand-in for OrchestratorConnection recording log messages."""
+
+    def __init__(self):
+        self.messages = []
+
+    def log_trace(self, message: str) -> None:
+        """Record a trace message."""
+        self.messages.append(message)
+
+    def log_info(self, message: str) -> None:
+        """Record an info message."""
+        self.messages.append(message)
+
+
+@pytest.fixture(autouse=True)
+def empty_pool(monkeypatch):
+    """Give each test an empty pool and a fake pyodbc.connect."""
+    monkeypatch.setattr(connection_pool, "_connections", {})
+    monkeypatch.setattr(connection_pool, "_connection_strings", {})
+    monkeypatch.setattr(connection_pool, "_metrics", {})
+    monkeypatch.setattr(connection_pool.pyodbc, "connect", FakeConnection)
+
+
+def test_reuse_healthy_connection():
+    """A healthy connection is reused."""
+    first = connection_pool.get_connection("db", "conn")
+    second = connection_pool.get_connection("db", "conn")
+
+    assert first is second
+    metrics = connection_pool.get_metrics()["db"]
+    assert metrics.connect_count == 1
+    assert metrics.reuse_count == 1
+    assert len(metrics.connect_times) == 1
+
+
+def test_reconnect_on_failed_health_check():
+    """A connection that fails the health check is closed and replaced."""
+    first = connection_pool.get_connection("db", "conn")
+    first.broken = True
+    second = connection_pool.get_connection("db", "conn")
+
+    assert second is not first
+    assert first.closed
+    metrics = connection_pool.get_metrics()["db"]
+    assert metrics.connect_count == 2
+    assert metrics.failed_health_checks == 1
+
+
+def test_reconnect_on_changed_connection_string():
+    """A new connection string replaces the pooled connection."""
+    first = connection_pool.get_connection("db", "old")
+    second = connection_pool.get_connection("db", "new")
+
+    assert second is not first
+    assert first.closed
+    assert second.connection_string == "new"
+    assert connection_pool.get_metrics()["db"].failed_health_checks == 0
+
+
+def test_remove_unhealthy():
+    """Only unhealthy connections are removed from the pool."""
+    healthy = connection_pool.get_connection("healthy", "conn")
+    broken = connection_pool.get_connection("broken", "conn")
+    broken.broken = True
+
+    connection_pool.remove_unhealthy()
+
+    assert broken.closed
+    assert not healthy.closed
+    assert connection_pool.get_connection("healthy", "conn") is healthy
+    assert connection_pool.get_connection("broken", "conn") is not broken
+    assert connection_pool.get_metrics()["broken"].failed_health_checks == 1
+
+
+def test_rollback_all():
+    """Open connections are rolled back and closed ones are skipped."""
+    open_connection = connection_pool.get_connection("open", "conn")
+    closed_connection = connection_pool.get_connection("closed", "conn")
+    closed_connection.closed = True
+
+    connection_pool.rollback_all()
+
+    assert open_connection.rollback_count == 1
+    assert closed_connection.rollback_count == 0
+
+
+def test_close_all():
+    """All connections are closed and the metrics are logged."""
+    connection = connection_pool.get_connection("db", "conn")
+    orchestrator_connection = FakeOrchestratorConnection()
+
+    connection_pool.close_all(orchestrator_connection)
+
+    assert connection.closed
+    assert connection_pool.get_connection("db", "conn") is not connection
+    assert any(m.startswith("Connection metrics for db: 1 connects") for m in orchestrator_connection.messages)
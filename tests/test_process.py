@@ -0,0 +1,123 @@
+"""Tests for the wiring of the run scheduler in the main process."""
+
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from robot_framework import process
+from robot_framework.sub_process.database import Person
+from robot_framework.sub_process.scheduler import RunScheduler, StopReason
+
+
+class FakeOrchestratorConnection:
+    """A stand-in for OrchestratorConnection."""
+
+    process_name = "Udrejsekontrol"
+
+    def __init__(self, process_arguments: dict):
+        self.process_arguments = json.dumps(process_arguments)
+        self.messages = []
+
+    def get_credential(self, _name: str) -> SimpleNamespace:
+        """Return a dummy credential."""
+        return SimpleNamespace(username="user", password="{}")
+
+    def get_constant(self, _name: str) -> SimpleNamespace:
+        """Return a dummy constant."""
+        return SimpleNamespace(value="value")
+
+    def log_trace(self, message: str) -> None:
+        """Record a trace message."""
+        self.messages.append(message)
+
+    def log_info(self, message: str) -> None:
+        """Record an info message."""
+        self.messages.append(message)
+
+
+@pytest.fixture(name="checked")
+def external_systems_fixture(monkeypatch) -> list[str]:
+    """Replace all external systems used by the process and return the list of checked cpr numbers."""
+    checked = []
+    candidates = [Person(str(i), "Name", "Address", 1) for i in range(5)]
+
+    def check_income(cpr, _caller_info, _signer):
+        checked.append(cpr)
+        return False
+
+    monkeypatch.setattr(process, "NovaAccess", lambda *args: None)
+    monkeypatch.setattr(process.connection_pool, "get_connection", lambda *args: None)
+    monkeypatch.setattr(process.event_log, "setup_logging", lambda *args: None)
+    monkeypatch.setattr(process.event_log, "emit", lambda *args: None)
+    monkeypatch.setattr(process.database, "get_candidate_list", lambda *args: candidates)
+    monkeypatch.setattr(process.database, "update_person", lambda *args: None)
+    monkeypatch.setattr(process.skat_webservice, "setup_webservice", lambda *args: (None, None))
+    monkeypatch.setattr(process.skat_webservice, "check_income", check_income)
+    monkeypatch.setattr(process.nova, "add_case", lambda *args: None)
+
+    return checked
+
+
+def test_find_cases_stops_on_skat_call_budget(checked):
+    """find_cases stops when the scheduler's SKAT call budget is used."""
+    scheduler = RunScheduler(10, timedelta(minutes=5), max_skat_calls=2)
+    process.find_cases(scheduler, FakeOrchestratorConnection({}))
+
+    assert checked == ["0", "1"]
+    assert scheduler.stop_reason == StopReason.SKAT_CALL_BUDGET
+    assert scheduler.found_count == 2
+
+
+def test_find_cases_marks_candidates_exhausted(checked):
+    """find_cases records when it runs out of candidates."""
+    scheduler = RunScheduler(10, timedelta(minutes=5), max_skat_calls=None)
+    process.find_cases(scheduler, FakeOrchestratorConnection({}))
+
+    assert len(checked) == 5
+    assert scheduler.stop_reason == StopReason.CANDIDATES_EXHAUSTED
+
+
+@pytest.fixture(name="sent_emails")
+def mail_fixture(monkeypatch) -> list[str]:
+    """Replace Graph and SMTP with a single request for 10 cases and return the sent email bodies."""
+    mail = SimpleNamespace(
+        sender="noreply@aarhus.dk",
+        subject="RPA - Udrejsekontrol (fra Selvbetjening.aarhuskommune.dk)",
+        received_time="2026-01-01T00:00:00",
+        get_text=lambda: "BrugerE-mail: user@aarhus.dkAZ-ident: az12345Antal ønskede sager10"
+    )
+    sent_emails = []
+
+    monkeypatch.setattr(process.graph_authentication, "authorize_by_username_password", lambda *args, **kwargs: None)
+    monkeypatch.setattr(process.graph_mail, "get_emails_from_folder", lambda *args: [mail])
+    monkeypatch.setattr(process.graph_mail, "delete_email", lambda *args: None)
+    monkeypatch.setattr(process.smtp_util, "send_email", lambda receiver, sender, subject, body, **kwargs: sent_emails.append(body))
+
+    return sent_emails
+
+
+def test_process_uses_skat_call_budget(checked, sent_emails):
+    """The SKAT call budget from the process arguments reaches the scheduler and the report."""
+    process.process(FakeOrchestratorConnection({"approved_senders": ["az12345"], "max_skat_calls": 3}))
+
+    assert len(checked) == 3
+    assert "grænsen på 3 opslag" in sent_emails[0]
+
+
+def test_process_null_skat_call_budget(checked, sent_emails):
+    """An explicit null SKAT call budget removes the limit."""
+    process.process(FakeOrchestratorConnection({"approved_senders": ["az12345"], "max_skat_calls": None}))
+
+    assert len(checked) == 5
+    assert "ikke flere personer" in sent_emails[0]
+
+
+@pytest.mark.usefixtures("checked")
+def test_process_rejects_invalid_budget(sent_emails):
+    """An invalid budget fails before any request is handled."""
+    with pytest.raises(ValueError):
+        process.process(FakeOrchestratorConnection({"approved_senders": ["az12345"], "time_budget_minutes": float("inf")}))
+
+    assert not sent_emails
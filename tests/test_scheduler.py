@@ -0,0 +1,159 @@
+"""Tests for the run scheduler."""
+
+from datetime import timedelta
+
+import pytest
+
+from robot_framework import config
+from robot_framework.sub_process.scheduler import RunScheduler, StopReason, read_time_budget, read_max_skat_calls
+
+
+class FakeClock:
+    """A controllable clock to inject into the scheduler."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward."""
+        self.now += seconds
+
+
+@pytest.fixture(name="clock")
+def clock_fixture() -> FakeClock:
+    """Create a fake clock starting at 0."""
+    return FakeClock()
+
+
+def test_request_fulfilled(clock):
+    """The run stops when the requested number of cases is found."""
+    scheduler = RunScheduler(2, timedelta(minutes=5), clock=clock)
+    while scheduler.should_continue():
+        clock.advance(1)
+        scheduler.record_check(1, True)
+
+    assert scheduler.stop_reason == StopReason.REQUEST_FULFILLED
+    assert scheduler.found_count == 2
+    assert "oprettet 2 af 2" in scheduler.progress_report()
+
+
+def test_requested_count_zero(clock):
+    """Nothing is checked when no cases are requested."""
+    scheduler = RunScheduler(0, timedelta(minutes=5), clock=clock)
+
+    assert not scheduler.should_continue()
+    assert scheduler.stop_reason == StopReason.REQUEST_FULFILLED
+    assert scheduler.estimate_remaining_checks() == 0
+
+
+def test_skat_call_budget(clock):
+    """The run stops when the SKAT call budget is used and no ETA can be given without any hits."""
+    scheduler = RunScheduler(5, timedelta(minutes=5), max_skat_calls=3, clock=clock)
+    while scheduler.should_continue():
+        clock.advance(1)
+        scheduler.record_check(1, False)
+
+    assert scheduler.stop_reason == StopReason.SKAT_CALL_BUDGET
+    assert scheduler.handled_count == 3
+    assert scheduler.hit_rate == 0
+    assert scheduler.estimate_time_to_completion() is None
+    assert "grænsen på 3 opslag" in scheduler.progress_report()
+    assert "ikke fundet nok sager" in scheduler.progress_report()
+
+
+def test_time_budget(clock):
+    """The run stops before a check that would overrun the time budget and reports an ETA."""
+    scheduler = RunScheduler(10, timedelta(seconds=100), clock=clock)
+    while scheduler.should_continue():
+        clock.advance(30)
+        scheduler.record_check(30, scheduler.handled_count % 2 == 0)
+
+    assert scheduler.stop_reason == StopReason.TIME_BUDGET
+    assert scheduler.handled_count == 3
+    assert scheduler.hit_rate == pytest.approx(2 / 3)
+    assert scheduler.estimate_remaining_checks() == 12
+    assert scheduler.estimate_time_to_completion() == timedelta(minutes=6)
+
+    report = scheduler.progress_report()
+    assert "tidsrammen på 2 minutter" in report
+    assert "ca. 12 opslag mere og 6 minutter" in report
+
+
+def test_zero_time_budget(clock):
+    """A zero time budget allows no checks once the check duration is known."""
+    scheduler = RunScheduler(5, timedelta(0), clock=clock)
+    scheduler.record_check(1, False)
+
+    assert not scheduler.should_continue()
+    assert scheduler.stop_reason == StopReason.TIME_BUDGET
+    assert "tidsrammen på 1 minut " in scheduler.progress_report()
+
+
+def test_no_hit_rate_before_checks(clock):
+    """No estimates are made before any candidate is checked."""
+    scheduler = RunScheduler(5, timedelta(minutes=5), clock=clock)
+
+    assert scheduler.hit_rate is None
+    assert scheduler.estimate_remaining_checks() is None
+    assert scheduler.estimate_time_to_completion() is None
+
+
+def test_candidates_exhausted(clock):
+    """Running out of candidates is recorded and reported."""
+    scheduler = RunScheduler(5, timedelta(minutes=5), clock=clock)
+    assert scheduler.should_continue()
+    clock.advance(1)
+    scheduler.record_check(1, True)
+    scheduler.mark_candidates_exhausted()
+
+    assert scheduler.stop_reason == StopReason.CANDIDATES_EXHAUSTED
+    assert "ikke flere personer" in scheduler.progress_report()
+
+
+def test_candidates_exhausted_after_last_case(clock):
+    """A request fulfilled by the last candidate is not reported as exhausted."""
+    scheduler = RunScheduler(1, timedelta(minutes=5), clock=clock)
+    scheduler.record_check(1, True)
+    scheduler.mark_candidates_exhausted()
+
+    assert scheduler.stop_reason == StopReason.REQUEST_FULFILLED
+
+
+@pytest.mark.parametrize("process_arguments, expected", [
+    ({}, timedelta(minutes=config.TIME_BUDGET_MINUTES)),
+    ({"time_budget_minutes": None}, timedelta(minutes=config.TIME_BUDGET_MINUTES)),
+    ({"time_budget_minutes": 0}, timedelta(0)),
+    ({"time_budget_minutes": 2.5}, timedelta(seconds=150)),
+    ({"time_budget_minutes": config.MAX_TIME_BUDGET_MINUTES}, timedelta(minutes=config.MAX_TIME_BUDGET_MINUTES)),
+])
+def test_read_time_budget(process_arguments, expected):
+    """Valid time budgets are read and missing ones use the default."""
+    assert read_time_budget(process_arguments) == expected
+
+
+@pytest.mark.parametrize("value", [-1, "60", True, float("inf"), float("nan"), config.MAX_TIME_BUDGET_MINUTES + 1, 1e20])
+def test_read_time_budget_invalid(value):
+    """Invalid time budgets raise a ValueError."""
+    with pytest.raises(ValueError):
+        read_time_budget({"time_budget_minutes": value})
+
+
+@pytest.mark.parametrize("process_arguments, expected", [
+    ({}, config.MAX_SKAT_CALLS),
+    ({"max_skat_calls": None}, None),
+    ({"max_skat_calls": 0}, 0),
+    ({"max_skat_calls": 1000}, 1000),
+])
+def test_read_max_skat_calls(process_arguments, expected):
+    """A missing SKAT call budget uses the default and null means no limit."""
+    assert read_max_skat_calls(process_arguments) == expected
+
+
+@pytest.mark.parametrize("value", [-1, 2.5, "400", True, float("inf")])
+def test_read_max_skat_calls_invalid(value):
+    """Invalid SKAT call budgets raise a ValueError."""
+    with pytest.raises(ValueError):
+        read_max_skat_calls({"max_skat_calls": value})